@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""SageMaker inference handler and serving app for PyTorch models."""
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import io
+
+import numpy as np
+import torch
+import torch.nn as nn
+from flask import Flask, Response, request
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# This process only ever runs inference, so turn autograd off once at
+# import instead of re-entering no_grad() per request.
+torch.set_grad_enabled(False)
+
+
+def _json_loads(data):
+    """Parse JSON with orjson when available; it accepts bytes directly."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode()
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    """Serialize to JSON bytes with orjson when available.
+
+    orjson encodes numpy arrays natively via OPT_SERIALIZE_NUMPY, so
+    callers can hand ndarrays through without a .tolist() copy.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    # stdlib fallback: convert arrays only when the encoder meets them.
+    return json.dumps(obj, default=lambda o: o.tolist())
+
+
+# Loaded models keyed by model_dir. SageMaker pings /ping every few
+# seconds and calls model_fn per invocation; rebuilding the nn.Module
+# and re-reading the state dict each time would dominate the warm path.
+# The cached instance already has .eval() applied.
+_MODEL_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+# Flipped after the first successful model load; health probes then
+# reduce to a flag read.
+_READY = False
+
+# Identical payloads (health pingers, client retries, duplicate A/B
+# traffic) produce identical predictions, so memoize serialized
+# responses keyed by a fast hash of the raw request bytes. blake2b is
+# several times faster than md5 on short payloads.
+_PRED_CACHE = collections.OrderedDict()
+_PRED_CACHE_LOCK = threading.Lock()
+_PRED_CACHE_SIZE = 1024
+_PRED_CACHE_TTL = 60
+
+
+def _prediction_cache_get(key):
+    """Return the cached response body for key, or None."""
+    with _PRED_CACHE_LOCK:
+        hit = _PRED_CACHE.get(key)
+        if hit is None:
+            return None
+        ts, body = hit
+        if time.monotonic() - ts >= _PRED_CACHE_TTL:
+            del _PRED_CACHE[key]
+            return None
+        _PRED_CACHE.move_to_end(key)
+        return body
+
+
+def _prediction_cache_put(key, body):
+    """Store a response body, evicting least-recently-used entries."""
+    with _PRED_CACHE_LOCK:
+        _PRED_CACHE[key] = (time.monotonic(), body)
+        _PRED_CACHE.move_to_end(key)
+        while len(_PRED_CACHE) > _PRED_CACHE_SIZE:
+            _PRED_CACHE.popitem(last=False)
+
+app = Flask(__name__)
+
+
+class SimpleModel(nn.Module):
+    """Small feed-forward classifier matching the training script.
+
+    The layer layout (and therefore the state-dict key names) must stay
+    in lockstep with templates/sagemaker-training-job/training_script.py
+    or load_state_dict rejects every trained model.pth.
+    """
+
+    def __init__(self, input_size, hidden_size, num_classes):
+        super().__init__()
+        self.net = nn.Sequential(
+            nn.Linear(input_size, hidden_size),
+            nn.ReLU(inplace=True),
+            nn.Dropout(0.2),
+            nn.Linear(hidden_size, hidden_size),
+            nn.ReLU(inplace=True),
+            nn.Linear(hidden_size, num_classes),
+        )
+
+    def forward(self, x):
+        return self.net(x)
+
+
+def model_fn(model_dir):
+    """Load the model for the given directory, reusing a cached instance."""
+    global _READY
+    model = _MODEL_CACHE.get(model_dir)
+    if model is not None:
+        return model
+    with _CACHE_LOCK:
+        model = _MODEL_CACHE.get(model_dir)
+        if model is None:
+            config_path = os.path.join(model_dir, 'config.json')
+            with open(config_path) as f:
+                config = json.load(f)
+            logger.info(f"📦 Loading model from {model_dir}")
+            model = SimpleModel(
+                input_size=config['input_size'],
+                hidden_size=config['hidden_size'],
+                num_classes=config['num_classes']
+            )
+            state_dict = torch.load(os.path.join(model_dir, 'model.pth'),
+                                    map_location='cpu')
+            model.load_state_dict(state_dict)
+            model.eval()
+            if os.environ.get('ENABLE_INT8') == '1':
+                # Dynamic quantization swaps the FP32 Linear GEMMs for
+                # INT8 kernels with activation scales computed on the
+                # fly — no calibration pass needed. Roughly 4x smaller
+                # weights and 2-4x CPU throughput on VNNI hardware;
+                # opt-in because it trades a little accuracy.
+                model = torch.quantization.quantize_dynamic(
+                    model, {nn.Linear}, dtype=torch.qint8)
+            # Trace and freeze once at load time: fuses the small
+            # Linear/ReLU ops, constant-folds the eval-mode Dropout away
+            # and drops the per-request Python module traversal.
+            try:
+                example = torch.zeros(1, config['input_size'], dtype=torch.float32)
+                model = torch.jit.freeze(torch.jit.trace(model, example))
+            except Exception as e:
+                logger.warning(f"⚠️ torch.jit trace failed, serving eager model: {e}")
+            _MODEL_CACHE[model_dir] = model
+            _READY = True
+    return model
+
+
+def input_fn(request_body, content_type='application/json'):
+    """Deserialize the request body into a float32 feature matrix."""
+    if content_type == 'application/json':
+        data = _json_loads(request_body)
+        instances = data['instances'] if isinstance(data, dict) else data
+        array = np.array(instances, dtype=np.float32)
+    elif content_type == 'text/csv':
+        # The payload is homogeneous numeric CSV, so parse it straight
+        # into a float32 array instead of paying for the pandas parser,
+        # dtype inference and DataFrame construction per request.
+        buf = request_body.encode() if isinstance(request_body, str) else request_body
+        array = np.loadtxt(io.BytesIO(buf), delimiter=',', dtype=np.float32, ndmin=2)
+    else:
+        raise ValueError(f"Unsupported content type: {content_type}")
+    if array.ndim == 1:
+        array = array.reshape(1, -1)
+    # Contiguous float32 lets predict_fn alias the buffer zero-copy.
+    return np.ascontiguousarray(array, dtype=np.float32)
+
+
+def predict_fn(input_data, model):
+    """Run a forward pass and return class probabilities."""
+    # from_numpy aliases the contiguous float32 buffer built by input_fn,
+    # where torch.tensor() always copied it. inference_mode goes further
+    # than the module-level grad toggle: it also skips version counters
+    # and view tracking on every tensor the forward pass touches.
+    with torch.inference_mode():
+        input_tensor = torch.from_numpy(input_data)
+        outputs = model(input_tensor)
+        predictions = torch.softmax(outputs, dim=1)
+    # .numpy() on a contiguous CPU tensor is a view of the same buffer.
+    if not predictions.is_contiguous():
+        predictions = predictions.contiguous()
+    return predictions.numpy()
+
+
+def output_fn(prediction, accept='application/json'):
+    """Serialize the prediction for the response."""
+    if accept == 'application/json':
+        # One reduction pass: gather each row's winning probability from
+        # the argmax indices instead of re-scanning the batch with
+        # np.max.
+        predicted_classes = np.argmax(prediction, axis=1)
+        confidences = np.take_along_axis(
+            prediction, predicted_classes[:, None], axis=1).squeeze(1)
+        result = {
+            'predictions': prediction,
+            'predicted_classes': predicted_classes,
+            'confidences': confidences
+        }
+        return _json_dumps(result)
+    elif accept == 'text/csv':
+        buf = io.BytesIO()
+        np.savetxt(buf, np.argmax(prediction, axis=1), fmt='%d')
+        return buf.getvalue()
+    raise ValueError(f"Unsupported accept type: {accept}")
+
+
+# Dynamic batching: a single-instance request pays a full forward pass
+# on a batch of one. Concurrent requests arriving within this window are
+# stacked into one model call instead.
+_MAX_BATCH_SIZE = 32
+_MAX_BATCH_DELAY = 0.005
+
+
+class BatchQueue:
+    """Coalesces concurrent prediction requests into batched forward passes.
+
+    Callers enqueue their input array and block on an event; a worker
+    thread drains the queue for up to _MAX_BATCH_DELAY seconds (or
+    _MAX_BATCH_SIZE items), runs one predict_fn on the stacked batch and
+    scatters the output rows back to the waiting callers.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def predict(self, input_array, model):
+        """Submit one request and block until its rows come back."""
+        self._ensure_worker()
+        event = threading.Event()
+        slot = {}
+        self._queue.put((input_array, model, event, slot))
+        event.wait()
+        if 'error' in slot:
+            raise slot['error']
+        return slot['result']
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    worker = threading.Thread(target=self._run, daemon=True)
+                    worker.start()
+                    self._worker = worker
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + _MAX_BATCH_DELAY
+            while len(items) < _MAX_BATCH_SIZE and time.monotonic() < deadline:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._flush(items)
+
+    def _flush(self, items):
+        # np.concatenate requires matching feature widths, and padding
+        # narrower rows up to the widest request would waste compute on
+        # filler. Group the pending items by width and run one forward
+        # pass per bucket.
+        buckets = collections.defaultdict(list)
+        for item in items:
+            buckets[item[0].shape[1]].append(item)
+        for bucket in buckets.values():
+            self._flush_bucket(bucket)
+
+    def _flush_bucket(self, items):
+        model = items[-1][1]
+        try:
+            batch = np.concatenate([item[0] for item in items], axis=0)
+            outputs = predict_fn(batch, model)
+            offset = 0
+            for input_array, _, event, slot in items:
+                rows = input_array.shape[0]
+                slot['result'] = outputs[offset:offset + rows]
+                offset += rows
+                event.set()
+        except Exception as e:
+            for _, _, event, slot in items:
+                slot['error'] = e
+                event.set()
+
+
+_BATCHER = BatchQueue()
+
+
+def health_check():
+    """Report serving readiness.
+
+    The first probe performs the real model load as a warm-up; once it
+    succeeds, SageMaker's every-few-seconds pings reduce to a flag read
+    instead of touching the model at all.
+    """
+    if _READY:
+        return {'status': 'healthy'}
+    try:
+        model_fn(os.environ.get('SM_MODEL_DIR', '/opt/ml/model'))
+        return {'status': 'healthy'}
+    except Exception as e:
+        logger.error(f"❌ Health check failed: {e}")
+        return {'status': 'unhealthy', 'error': str(e)}
+
+
+@app.route('/ping', methods=['GET'])
+def ping():
+    """SageMaker container health probe."""
+    status = health_check()
+    code = 200 if status['status'] == 'healthy' else 503
+    return Response(json.dumps(status), status=code, mimetype='application/json')
+
+
+@app.route('/invocations', methods=['POST'])
+def invocations():
+    """SageMaker inference endpoint."""
+    content_type = request.content_type or 'application/json'
+    accept = request.headers.get('Accept', 'application/json')
+    if accept == '*/*':
+        accept = 'application/json'
+    raw_body = request.get_data()
+    # Hash before parsing: a cache hit skips input_fn, the forward pass
+    # and serialization entirely.
+    cache_key = (content_type, accept,
+                 hashlib.blake2b(raw_body, digest_size=16).digest())
+    cached = _prediction_cache_get(cache_key)
+    if cached is not None:
+        return Response(cached, status=200, mimetype=accept)
+    try:
+        model = model_fn(os.environ.get('SM_MODEL_DIR', '/opt/ml/model'))
+        input_data = input_fn(raw_body, content_type)
+        prediction = _BATCHER.predict(input_data, model)
+        body = output_fn(prediction, accept)
+        _prediction_cache_put(cache_key, body)
+        return Response(body, status=200, mimetype=accept)
+    except ValueError as e:
+        logger.error(f"❌ Bad request: {e}")
+        return Response(json.dumps({'error': str(e)}), status=400,
+                        mimetype='application/json')
+    except Exception as e:
+        logger.error(f"❌ Inference failed: {e}")
+        return Response(json.dumps({'error': str(e)}), status=500,
+                        mimetype='application/json')
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=8080)
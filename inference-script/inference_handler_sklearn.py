@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""SageMaker inference handler for scikit-learn models."""
+
+import json
+import logging
+import operator
+import os
+import threading
+import io
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _json_loads(data):
+    """Parse JSON with orjson when available; it accepts bytes directly."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode()
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    """Serialize to JSON bytes with orjson when available.
+
+    orjson encodes numpy arrays natively via OPT_SERIALIZE_NUMPY, so
+    callers can hand ndarrays through without a .tolist() copy.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    # stdlib fallback: convert arrays only when the encoder meets them.
+    return json.dumps(obj, default=lambda o: o.tolist())
+
+
+# Loaded models keyed by model_dir. SageMaker calls model_fn on every
+# invocation and health probe; deserializing the estimator each time
+# would dominate the warm path, so after the first load this is a dict
+# lookup.
+_MODEL_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+# Flipped after the first successful model load; health probes then
+# reduce to a flag read.
+_READY = False
+
+
+# Per-thread response mapping reused across requests; predict_fn fills
+# the same dict each time instead of allocating a fresh one per call.
+_RESPONSE = threading.local()
+
+
+def _response_dict():
+    """Return this thread's cleared response scratch dict."""
+    d = getattr(_RESPONSE, 'd', None)
+    if d is None:
+        d = {}
+        _RESPONSE.d = d
+    else:
+        d.clear()
+    return d
+
+
+def model_fn(model_dir):
+    """Load the model for the given directory, reusing a cached instance."""
+    global _READY
+    model = _MODEL_CACHE.get(model_dir)
+    if model is not None:
+        return model
+    with _CACHE_LOCK:
+        model = _MODEL_CACHE.get(model_dir)
+        if model is None:
+            # Deferred: joblib (and the sklearn stack it pulls in) only
+            # loads on the first model_fn call, not at container start.
+            import joblib
+
+            model_path = os.path.join(model_dir, 'model.joblib')
+            logger.info(f"📦 Loading model from {model_path}")
+            # mmap_mode='r' maps the numpy arrays inside the pickle
+            # instead of copying them into the heap: cold start skips a
+            # model-sized memcpy and multiple workers share the pages.
+            # Compressed dumps cannot be mapped, so fall back to a plain
+            # load for those.
+            try:
+                model = joblib.load(model_path, mmap_mode='r')
+            except ValueError:
+                model = joblib.load(model_path)
+            _MODEL_CACHE[model_dir] = model
+            _READY = True
+    return model
+
+
+# Column order memoized per schema so repeat requests skip rebuilding it.
+_KEYS_CACHE = {}
+
+
+def _instances_to_array(instances):
+    """Convert a list of feature dicts to a float32 matrix.
+
+    Building a DataFrame here just to take .values paid BlockManager
+    construction and consolidation per request; instead fill a
+    preallocated array through a C-level itemgetter.
+    """
+    schema = frozenset(instances[0])
+    keys = _KEYS_CACHE.get(schema)
+    if keys is None:
+        keys = tuple(instances[0].keys())
+        _KEYS_CACHE[schema] = keys
+    getter = operator.itemgetter(*keys)
+    rows, cols = len(instances), len(keys)
+    if rows >= 1024 and cols > 1:
+        # For big batches, fromiter drains the chained generator in one
+        # C-level loop straight into a flat float32 buffer, skipping the
+        # per-row Python assignment below.
+        flat = np.fromiter(
+            (value for instance in instances for value in getter(instance)),
+            dtype=np.float32, count=rows * cols)
+        return flat.reshape(rows, cols)
+    array = np.empty((rows, cols), dtype=np.float32)
+    for i, instance in enumerate(instances):
+        array[i] = getter(instance)
+    return array
+
+
+def input_fn(request_body, content_type='application/json'):
+    """Deserialize the request body into a feature matrix."""
+    if content_type == 'application/json':
+        data = _json_loads(request_body)
+        instances = data['instances'] if isinstance(data, dict) else data
+        if instances and isinstance(instances[0], dict):
+            return _instances_to_array(instances)
+        return np.array(instances)
+    elif content_type == 'text/csv':
+        # The payload is homogeneous numeric CSV, so parse it straight
+        # into a float32 array instead of paying for the pandas parser,
+        # dtype inference and DataFrame construction per request.
+        buf = request_body.encode() if isinstance(request_body, str) else request_body
+        array = np.loadtxt(io.BytesIO(buf), delimiter=',', dtype=np.float32, ndmin=2)
+        return array
+    raise ValueError(f"Unsupported content type: {content_type}")
+
+
+def predict_fn(input_data, model):
+    """Run inference on the deserialized payload."""
+    # For classifiers, predict() is just an argmax over predict_proba(),
+    # so calling both ran the estimator twice. One probability pass plus
+    # a cheap argmax yields the same labels.
+    result = _response_dict()
+    if hasattr(model, 'predict_proba'):
+        probabilities = model.predict_proba(input_data)
+        result['predictions'] = model.classes_[np.argmax(probabilities, axis=1)]
+        result['probabilities'] = probabilities
+    else:
+        result['predictions'] = model.predict(input_data)
+    return result
+
+
+def output_fn(prediction, accept='application/json'):
+    """Serialize the prediction for the response."""
+    if accept == 'application/json':
+        return _json_dumps(prediction)
+    elif accept == 'text/csv':
+        buf = io.BytesIO()
+        np.savetxt(buf, np.asarray(prediction['predictions']), fmt='%g', delimiter=',')
+        return buf.getvalue()
+    raise ValueError(f"Unsupported accept type: {accept}")
+
+
+def health_check():
+    """Report serving readiness.
+
+    The first probe performs the real model load as a warm-up; once it
+    succeeds, SageMaker's every-few-seconds pings reduce to a flag read
+    instead of touching the model at all.
+    """
+    if _READY:
+        return {'status': 'healthy'}
+    try:
+        model_fn(os.environ.get('SM_MODEL_DIR', '/opt/ml/model'))
+        return {'status': 'healthy'}
+    except Exception as e:
+        logger.error(f"❌ Health check failed: {e}")
+        return {'status': 'unhealthy', 'error': str(e)}
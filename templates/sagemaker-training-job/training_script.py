@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Training entry script for SageMaker training jobs (XGBoost and PyTorch)."""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+import torch.optim as optim
+import xgboost as xgb
+from torch.utils.data import DataLoader, Dataset
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Allow TF32 matmuls on Ampere+ GPUs: ~2x throughput over strict FP32
+# with precision that is a non-issue for this workload. No effect on CPU.
+torch.set_float32_matmul_precision('high')
+
+
+def load_data(args):
+    """Load training and validation data.
+
+    Reads the CSV channels when present; otherwise generates a small
+    synthetic dataset so the CI demo pipeline can run end to end.
+    """
+    train_path = os.path.join(args.train, 'train.csv')
+    validation_path = os.path.join(args.validation, 'validation.csv')
+    if os.path.exists(train_path) and os.path.exists(validation_path):
+        logger.info(f"📥 Loading training data from {train_path}")
+        # The pyarrow engine tokenizes the CSV across all cores; the
+        # default C parser is single-threaded and dominates preprocessing
+        # on large channels.
+        train_df = pd.read_csv(train_path, engine='pyarrow')
+        validation_df = pd.read_csv(validation_path, engine='pyarrow')
+        X_train = train_df.drop('target', axis=1).values
+        y_train = train_df['target'].values
+        X_val = validation_df.drop('target', axis=1).values
+        y_val = validation_df['target'].values
+    else:
+        logger.info("🧪 No input channels found, generating synthetic data")
+        # default_rng's PCG64 generates faster than the legacy Mersenne
+        # Twister, and producing float32/int64 directly avoids a full
+        # float64 intermediate that every consumer downcast anyway. The
+        # fixed seed keeps demo runs reproducible.
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((1000, 10), dtype=np.float32)
+        y = rng.integers(0, 3, 1000, dtype=np.int64)
+        X_train, X_val = X[:800], X[800:]
+        y_train, y_val = y[:800], y[800:]
+    logger.info(f"📊 Training samples: {len(y_train)}, validation samples: {len(y_val)}")
+    return X_train, y_train, X_val, y_val
+
+
+def _xgboost_device(requested='auto'):
+    """Resolve the XGBoost device, preferring CUDA when the build has it."""
+    if requested != 'auto':
+        return requested
+    try:
+        if xgb.build_info().get('USE_CUDA'):
+            return 'cuda'
+    except Exception:
+        pass
+    return 'cpu'
+
+
+def _train_csv_digest(train_path):
+    """Content hash of the training CSV, or None for synthetic data."""
+    if not os.path.exists(train_path):
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    with open(train_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_dmatrices(X_train, y_train, X_val, y_val, cache_dir=None, cache_key=None):
+    """Build the train/validation matrix pair, reusing a binary cache.
+
+    Fresh builds use QuantileDMatrix so hist trains on pre-binned data;
+    ref=dtrain makes dval reuse the training cuts, so validation data is
+    binned once with no second sketch pass. When a binary buffer from a
+    previous run matches the training CSV's content hash, it is loaded
+    directly instead — O(bytes read), no CSV parse and no sketch.
+    """
+    cache_path = None
+    if cache_dir and cache_key:
+        cache_path = os.path.join(cache_dir, f'dtrain-{cache_key}.buffer')
+        if os.path.exists(cache_path):
+            logger.info(f"♻️ Loading cached DMatrix buffer: {cache_path}")
+            dtrain = xgb.DMatrix(cache_path)
+            dval = xgb.DMatrix(X_val, label=y_val)
+            return dtrain, dval
+    dtrain = xgb.QuantileDMatrix(X_train, label=y_train)
+    dval = xgb.QuantileDMatrix(X_val, label=y_val, ref=dtrain)
+    if cache_path:
+        # QuantileDMatrix holds only binned data and has no binary
+        # serialization, so persist a plain DMatrix buffer for the next
+        # run to load without re-parsing the input.
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        xgb.DMatrix(X_train, label=y_train).save_binary(cache_path)
+        logger.info(f"💾 Saved DMatrix buffer for reuse: {cache_path}")
+    return dtrain, dval
+
+
+def train_xgboost_model(dtrain, dval, hyperparameters, device='auto'):
+    """Train an XGBoost model with the given hyperparameters."""
+    device = _xgboost_device(device)
+    logger.info(f"🚀 Training XGBoost model on {device} with: {hyperparameters}")
+    params = {
+        'objective': hyperparameters['objective'],
+        'max_depth': hyperparameters['max_depth'],
+        'eta': hyperparameters['eta'],
+        # The hist method's histogram build is the hot path; on CUDA
+        # builds it runs on the GPU, typically an order of magnitude
+        # faster than CPU hist on non-trivial data.
+        'tree_method': 'hist',
+        'device': device,
+    }
+    # Early stopping watches the held-out set; stopping on training
+    # loss never triggers and just overfits to num_round.
+    model = xgb.train(
+        params,
+        dtrain,
+        num_boost_round=hyperparameters['num_round'],
+        evals=[(dtrain, 'train'), (dval, 'val')],
+        early_stopping_rounds=10,
+        verbose_eval=False
+    )
+    logger.info("✅ XGBoost training completed")
+    return model
+
+
+def evaluate_model(model, dval, y_val, output_dir):
+    """Evaluate the trained booster on the validation set."""
+    logger.info("📈 Evaluating model on validation data")
+    y_pred = model.predict(dval)
+    # save_config returns a small JSON blob; get_dump() serialized every
+    # tree to text just to branch on one config string.
+    objective = json.loads(model.save_config())['learner']['objective']['name']
+    if y_pred.ndim > 1 or 'softmax' in objective or 'softprob' in objective:
+        y_classes = np.argmax(y_pred, axis=1) if y_pred.ndim > 1 else y_pred
+        accuracy = float(np.mean(y_classes == y_val))
+        metrics = {'accuracy': accuracy}
+        logger.info(f"📊 Validation accuracy: {accuracy:.4f}")
+    else:
+        rmse = float(np.sqrt(np.mean((y_pred - y_val) ** 2)))
+        mae = float(np.mean(np.abs(y_pred - y_val)))
+        metrics = {'rmse': rmse, 'mae': mae}
+        logger.info(f"📊 Validation RMSE: {rmse:.4f}")
+    os.makedirs(output_dir, exist_ok=True)
+    # Raw predictions are not a metric; JSON-listing them one float at a
+    # time made metrics.json O(n_val). np.save dumps the contiguous
+    # array in a single write for downstream reporting instead.
+    np.save(os.path.join(output_dir, 'predictions.npy'), y_pred)
+    with open(os.path.join(output_dir, 'metrics.json'), 'w') as f:
+        json.dump(metrics, f, indent=2)
+    return metrics
+
+
+class CustomDataset(Dataset):
+    """Wraps numpy feature/label arrays for the DataLoader."""
+
+    def __init__(self, data, labels):
+        # Convert once up front: per-sample torch.tensor() calls in
+        # __getitem__ paid an allocation, a copy and a dtype cast for
+        # every sample of every epoch. from_numpy on a contiguous array
+        # shares the buffer, so indexing below returns cheap views.
+        # Labels travel as int8 — 1 byte per sample instead of int64's 8
+        # through pinned memory and worker IPC; the training loop casts
+        # to long on-device where CrossEntropyLoss needs it.
+        self.data = torch.from_numpy(np.ascontiguousarray(data)).float()
+        self.labels = torch.from_numpy(
+            np.ascontiguousarray(labels, dtype=np.int8))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, idx):
+        return self.data[idx], self.labels[idx]
+
+
+class SimpleModel(nn.Module):
+    """Small feed-forward classifier."""
+
+    def __init__(self, input_size, hidden_size, num_classes):
+        super().__init__()
+        # A flat Sequential keeps forward to one C++ loop instead of
+        # per-layer Python attribute dispatch, and gives torch.compile a
+        # linear op list to fuse. inplace ReLUs overwrite their input
+        # activation buffer rather than allocating a second one.
+        self.net = nn.Sequential(
+            nn.Linear(input_size, hidden_size),
+            nn.ReLU(inplace=True),
+            nn.Dropout(0.2),
+            nn.Linear(hidden_size, hidden_size),
+            nn.ReLU(inplace=True),
+            nn.Linear(hidden_size, num_classes),
+        )
+
+    def forward(self, x):
+        return self.net(x)
+
+
+def train_model(model, train_loader, val_loader, device, epochs, learning_rate):
+    """Run the PyTorch training loop with per-epoch validation."""
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.parameters(), lr=learning_rate)
+    # bf16 autocast halves activation bandwidth and engages tensor cores
+    # on CUDA; unlike fp16 it shares FP32's exponent range, so no grad
+    # scaler is needed. Disabled on CPU where it mostly slows things down.
+    use_amp = device.type == 'cuda'
+
+    for epoch in range(epochs):
+        model.train()
+        train_loss = 0.0
+        for data, target in train_loader:
+            data = data.to(device, non_blocking=True)
+            # One fused copy-and-cast kernel widens the int8 labels back
+            # to long on the device.
+            target = target.to(device, non_blocking=True).long()
+            optimizer.zero_grad()
+            with torch.autocast(device_type=device.type,
+                                dtype=torch.bfloat16, enabled=use_amp):
+                output = model(data)
+                loss = criterion(output, target)
+            loss.backward()
+            optimizer.step()
+            train_loss += loss.item()
+
+        model.eval()
+        val_loss = 0.0
+        correct = 0
+        total = 0
+        with torch.no_grad():
+            for data, target in val_loader:
+                data = data.to(device, non_blocking=True)
+                target = target.to(device, non_blocking=True).long()
+                with torch.autocast(device_type=device.type,
+                                    dtype=torch.bfloat16, enabled=use_amp):
+                    output = model(data)
+                    val_loss += criterion(output, target).item()
+                predicted = output.argmax(dim=1)
+                correct += (predicted == target).sum().item()
+                total += target.size(0)
+
+        logger.info(
+            f"📊 Epoch {epoch + 1}/{epochs} - "
+            f"train loss: {train_loss / len(train_loader):.4f}, "
+            f"val loss: {val_loss / len(val_loader):.4f}, "
+            f"val accuracy: {correct / total:.4f}"
+        )
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SageMaker Training Script')
+    parser.add_argument('--framework', default='xgboost', choices=['xgboost', 'pytorch'],
+                        help='Framework to train with')
+    parser.add_argument('--model-dir', default=os.environ.get('SM_MODEL_DIR', '/opt/ml/model'),
+                        help='Directory to save the trained model')
+    parser.add_argument('--train', default=os.environ.get('SM_CHANNEL_TRAIN', '/opt/ml/input/data/train'),
+                        help='Directory containing the training data')
+    parser.add_argument('--validation', default=os.environ.get('SM_CHANNEL_VALIDATION', '/opt/ml/input/data/validation'),
+                        help='Directory containing the validation data')
+    parser.add_argument('--output-data-dir', default=os.environ.get('SM_OUTPUT_DATA_DIR', '/opt/ml/output/data'),
+                        help='Directory for metrics and other training output')
+    # XGBoost hyperparameters
+    parser.add_argument('--num-round', type=int, default=100, help='Boosting rounds')
+    parser.add_argument('--max-depth', type=int, default=6, help='Maximum tree depth')
+    parser.add_argument('--eta', type=float, default=0.3, help='Learning rate (eta)')
+    parser.add_argument('--objective', default='reg:squarederror', help='XGBoost objective')
+    parser.add_argument('--device', default='auto', choices=['auto', 'cpu', 'cuda'],
+                        help='XGBoost device; auto probes the build for CUDA support')
+    # PyTorch hyperparameters
+    parser.add_argument('--epochs', type=int, default=10, help='Training epochs')
+    parser.add_argument('--batch-size', type=int, default=32, help='Batch size')
+    parser.add_argument('--learning-rate', type=float, default=0.001, help='Learning rate')
+    parser.add_argument('--hidden-size', type=int, default=64, help='Hidden layer width')
+    parser.add_argument('--compile', default=None, action=argparse.BooleanOptionalAction,
+                        help='torch.compile the model; defaults to on for CUDA, off for CPU')
+
+    args = parser.parse_args()
+
+    X_train, y_train, X_val, y_val = load_data(args)
+    os.makedirs(args.model_dir, exist_ok=True)
+
+    if args.framework == 'xgboost':
+        hyperparameters = {
+            'num_round': args.num_round,
+            'max_depth': args.max_depth,
+            'eta': args.eta,
+            'objective': args.objective
+        }
+        # The buffer lands in the output data channel, not model_dir —
+        # the matrix is training-set sized and must not ship inside
+        # model.tar.gz to every endpoint. A rerun on the same train.csv
+        # skips parse and sketch.
+        dtrain, dval = build_dmatrices(
+            X_train, y_train, X_val, y_val,
+            cache_dir=os.path.join(args.output_data_dir, 'dmatrix-cache'),
+            cache_key=_train_csv_digest(os.path.join(args.train, 'train.csv')))
+        model = train_xgboost_model(dtrain, dval, hyperparameters, device=args.device)
+        evaluate_model(model, dval, y_val, args.output_data_dir)
+        model_path = os.path.join(args.model_dir, 'xgboost-model')
+        model.save_model(model_path)
+        logger.info(f"💾 Model saved to: {model_path}")
+    else:
+        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        logger.info(f"🚀 Training PyTorch model on {device}")
+        train_dataset = CustomDataset(X_train, y_train)
+        val_dataset = CustomDataset(X_val, y_val)
+        # Pinned host memory lets the CUDA driver DMA batches to the
+        # device asynchronously; combined with non_blocking copies in the
+        # training loop, the next batch transfers while the current one
+        # computes. Meaningless (and wasteful) without a GPU.
+        pin = device.type == 'cuda'
+        # A few workers keep batch collation off the training thread;
+        # capped at 4 because this dataset is in-memory tensor slicing
+        # and more workers just add IPC overhead. persistent_workers
+        # avoids re-forking the pool at every epoch boundary.
+        num_workers = min((os.cpu_count() or 2) // 2, 4)
+        loader_args = {
+            'batch_size': args.batch_size,
+            'pin_memory': pin,
+            'num_workers': num_workers,
+            'persistent_workers': num_workers > 0,
+        }
+        if num_workers > 0:
+            loader_args['prefetch_factor'] = 2
+        # Dropping the ragged tail batch keeps every training step at a
+        # fixed shape, so torch.compile's CUDA-graph capture is never
+        # invalidated by an epoch-end recompile. Validation keeps every
+        # sample — accuracy must cover the whole set.
+        train_loader = DataLoader(train_dataset, shuffle=True, drop_last=True,
+                                  **loader_args)
+        val_loader = DataLoader(val_dataset, shuffle=False, **loader_args)
+
+        num_classes = int(np.max(y_train)) + 1
+        model = SimpleModel(
+            input_size=X_train.shape[1],
+            hidden_size=args.hidden_size,
+            num_classes=num_classes
+        ).to(device)
+        # reduce-overhead uses CUDA graphs to replay the captured kernels,
+        # hiding per-step launch overhead, which dominates for a model
+        # this small. On CPU the compile time rarely pays for itself over
+        # a short run, so it stays opt-in there.
+        use_compile = args.compile if args.compile is not None else device.type == 'cuda'
+        if use_compile and hasattr(torch, 'compile'):
+            try:
+                model = torch.compile(model, mode='reduce-overhead')
+                logger.info("⚡ Compiled model with torch.compile")
+            except Exception as e:
+                logger.warning(f"⚠️ torch.compile failed, training eager model: {e}")
+        model = train_model(model, train_loader, val_loader, device,
+                            args.epochs, args.learning_rate)
+
+        # torch.compile wraps the module, prefixing state-dict keys with
+        # _orig_mod.; save from the underlying module so model.pth loads
+        # into a plain SimpleModel.
+        saved_model = getattr(model, '_orig_mod', model)
+        torch.save(saved_model.state_dict(), os.path.join(args.model_dir, 'model.pth'))
+        config = {
+            'input_size': X_train.shape[1],
+            'hidden_size': args.hidden_size,
+            'num_classes': num_classes
+        }
+        with open(os.path.join(args.model_dir, 'config.json'), 'w') as f:
+            json.dump(config, f, indent=2)
+        logger.info(f"💾 Model saved to: {args.model_dir}")
+
+    logger.info("🎉 Training run completed successfully")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,10 +2,42 @@
 
 import argparse
 import boto3
+import botocore.config
 import zipfile
 import os
 import sys
 import json
+from boto3.s3.transfer import TransferConfig
+
+# Already-compressed formats gain nothing from a second deflate pass;
+# storing them skips the CPU-bound zlib run over the largest members
+# (model.tar.gz dominates the archive).
+COMPRESSED_EXTENSIONS = ('.gz', '.tgz', '.zip', '.bz2', '.xz', '.zst', '.parquet')
+
+# zstd compresses 2-4x faster than zlib at comparable ratios; Python
+# 3.14 exposes it as a zipfile method, older runtimes fall back to
+# deflate.
+DEFAULT_COMPRESSION = getattr(zipfile, 'ZIP_ZSTANDARD', zipfile.ZIP_DEFLATED)
+
+def compress_type_for(file_path):
+    """Pick ZIP_STORED for already-compressed files, zstd/deflate otherwise."""
+    if file_path.lower().endswith(COMPRESSED_EXTENSIONS):
+        return zipfile.ZIP_STORED
+    return DEFAULT_COMPRESSION
+
+def iter_files(directory):
+    """Yield file paths under directory recursively via os.scandir.
+
+    DirEntry caches the file type from the directory read itself, so
+    is_file/is_dir cost no extra stat per entry, roughly halving the
+    syscalls os.walk's listdir+stat pattern issued.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry.path
 
 def main():
     parser = argparse.ArgumentParser(description='Create ZIP package and upload to S3')
@@ -22,7 +54,7 @@ def main():
     print(f"Creating {args.release_type} ZIP package: {args.zip_name}")
     
     # Create ZIP package
-    with zipfile.ZipFile(args.zip_name, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    with zipfile.ZipFile(args.zip_name, 'w', DEFAULT_COMPRESSION) as zipf:
         # Add metadata
         metadata = {
             'release_type': args.release_type,
@@ -36,15 +68,19 @@ def main():
         if args.pr_id:
             metadata['pr_id'] = args.pr_id
             
-        zipf.writestr('metadata.json', json.dumps(metadata, indent=2))
+        # metadata.json is tiny; compressor setup would cost more than
+        # the bytes it saves.
+        zipf.writestr('metadata.json', json.dumps(metadata, indent=2),
+                      compress_type=zipfile.ZIP_STORED)
         
         # Add training output if exists
         if args.training_output and os.path.exists(args.training_output):
-            for root, dirs, files in os.walk(args.training_output):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, args.training_output)
-                    zipf.write(file_path, f"training_output/{arcname}")
+            # Materialize the listing once so the write loop iterates a
+            # list instead of re-enumerating the filesystem.
+            for file_path in list(iter_files(args.training_output)):
+                arcname = os.path.relpath(file_path, args.training_output)
+                zipf.write(file_path, f"training_output/{arcname}",
+                           compress_type=compress_type_for(file_path))
         
         # Add CI/CD configuration
         if os.path.exists('.gitlab-ci.yml'):
@@ -52,22 +88,34 @@ def main():
             
         # Add source code
         if os.path.exists('src'):
-            for root, dirs, files in os.walk('src'):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, '.')
-                    zipf.write(file_path, arcname)
+            for file_path in list(iter_files('src')):
+                arcname = os.path.relpath(file_path, '.')
+                zipf.write(file_path, arcname,
+                           compress_type=compress_type_for(file_path))
     
     print(f"✅ ZIP package created: {args.zip_name}")
     
     # Upload to GitLab artifacts S3 bucket
     try:
-        s3_client = boto3.client('s3')
+        # A single TCP flow rarely saturates the runner's NIC; larger
+        # parts amortize per-request TLS/HTTP overhead and 16 parallel
+        # part uploads spread the artifact across connections.
+        s3_client = boto3.client('s3', config=botocore.config.Config(
+            tcp_keepalive=True,
+            max_pool_connections=32
+        ))
+        transfer_config = TransferConfig(
+            multipart_threshold=16 * 1024 * 1024,
+            multipart_chunksize=32 * 1024 * 1024,
+            max_concurrency=16,
+            use_threads=True
+        )
         bucket_name = os.getenv('GITLAB_ARTIFACTS_BUCKET')
-        
+
         if bucket_name:
             key = f"releases/{args.release_type}/{args.zip_name}"
-            s3_client.upload_file(args.zip_name, bucket_name, key)
+            s3_client.upload_file(args.zip_name, bucket_name, key,
+                                  Config=transfer_config)
             print(f"✅ Uploaded to S3: s3://{bucket_name}/{key}")
         else:
             print("⚠️ GITLAB_ARTIFACTS_BUCKET not set, skipping S3 upload")
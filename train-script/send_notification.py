@@ -1,26 +1,315 @@
 #!/usr/bin/env python3
 
 import argparse
+import json
+import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import boto3
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent outbound webhook requests. Chat platforms
+# rate-limit per webhook (Slack allows ~1 msg/sec), so an unbounded fan-out
+# across many channels would trip their limits.
+MAX_CONCURRENT_SENDS = 8
+
+STATUS_EMOJIS = {
+    'success': '✅',
+    'failed': '❌',
+    'canceled': '🛑',
+    'running': '🔄'
+}
+
+STATUS_COLORS = {
+    'success': '#36a64f',
+    'failed': '#ff0000',
+    'canceled': '#cccccc',
+    'running': '#439fe0'
+}
+
+
+class NotificationSender:
+    def __init__(self, pipeline_status, project_name, pipeline_url=None):
+        """Initialize the sender with pipeline context from CI variables."""
+        self.pipeline_status = pipeline_status
+        self.project_name = project_name
+        self.pipeline_url = pipeline_url or os.environ.get('CI_PIPELINE_URL', '')
+        self.pipeline_info = self._get_pipeline_info()
+        # Truncate once here instead of in every channel builder — they all
+        # render the same 200-character preview of the same string.
+        cm = self.pipeline_info['commit_message']
+        self.commit_message_truncated = (cm[:200] + '...') if len(cm) > 200 else cm
+
+    def _get_pipeline_info(self):
+        """Collect pipeline metadata from GitLab CI environment variables."""
+        return {
+            'pipeline_status': self.pipeline_status,
+            'project_name': self.project_name,
+            'pipeline_url': self.pipeline_url,
+            'pipeline_id': os.environ.get('CI_PIPELINE_ID', 'unknown'),
+            'pipeline_source': os.environ.get('CI_PIPELINE_SOURCE', 'unknown'),
+            'project_url': os.environ.get('CI_PROJECT_URL', ''),
+            'commit_sha': os.environ.get('CI_COMMIT_SHA', 'unknown'),
+            'commit_short_sha': os.environ.get('CI_COMMIT_SHORT_SHA', 'unknown'),
+            'commit_ref': os.environ.get('CI_COMMIT_REF_NAME', 'unknown'),
+            'commit_message': os.environ.get('CI_COMMIT_MESSAGE', 'No commit message'),
+            'commit_author': os.environ.get('CI_COMMIT_AUTHOR', 'unknown'),
+            'job_id': os.environ.get('CI_JOB_ID', 'unknown'),
+            'job_name': os.environ.get('CI_JOB_NAME', 'unknown'),
+            'job_url': os.environ.get('CI_JOB_URL', ''),
+            'runner_description': os.environ.get('CI_RUNNER_DESCRIPTION', 'unknown'),
+            'gitlab_user': os.environ.get('GITLAB_USER_NAME', 'unknown'),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _build_slack_payload(self):
+        """Build the Slack incoming-webhook payload."""
+        info = self.pipeline_info
+        status = info['pipeline_status']
+        emoji = STATUS_EMOJIS.get(status, 'ℹ️')
+        return {
+            'attachments': [{
+                'color': STATUS_COLORS.get(status, '#439fe0'),
+                'title': f"{emoji} Pipeline {status}: {info['project_name']}",
+                'title_link': info['pipeline_url'],
+                'fields': [
+                    {'title': 'Branch', 'value': info['commit_ref'], 'short': True},
+                    {'title': 'Commit', 'value': info['commit_short_sha'], 'short': True},
+                    {'title': 'Author', 'value': info['commit_author'], 'short': True},
+                    {'title': 'Job', 'value': info['job_name'], 'short': True},
+                    {'title': 'Message', 'value': self.commit_message_truncated, 'short': False}
+                ],
+                'ts': info['timestamp']
+            }]
+        }
+
+    def _build_teams_payload(self):
+        """Build the Microsoft Teams MessageCard payload."""
+        info = self.pipeline_info
+        status = info['pipeline_status']
+        emoji = STATUS_EMOJIS.get(status, 'ℹ️')
+        return {
+            '@type': 'MessageCard',
+            '@context': 'http://schema.org/extensions',
+            'themeColor': STATUS_COLORS.get(status, '#439fe0').lstrip('#'),
+            'summary': f"Pipeline {status}: {info['project_name']}",
+            'sections': [{
+                'activityTitle': f"{emoji} Pipeline {status}: {info['project_name']}",
+                'facts': [
+                    {'name': 'Branch', 'value': info['commit_ref']},
+                    {'name': 'Commit', 'value': info['commit_short_sha']},
+                    {'name': 'Author', 'value': info['commit_author']},
+                    {'name': 'Message', 'value': self.commit_message_truncated}
+                ]
+            }],
+            'potentialAction': [{
+                '@type': 'OpenUri',
+                'name': 'View Pipeline',
+                'targets': [{'os': 'default', 'uri': info['pipeline_url']}]
+            }]
+        }
+
+    def _build_discord_payload(self):
+        """Build the Discord webhook payload."""
+        info = self.pipeline_info
+        status = info['pipeline_status']
+        emoji = STATUS_EMOJIS.get(status, 'ℹ️')
+        return {
+            'embeds': [{
+                'title': f"{emoji} Pipeline {status}: {info['project_name']}",
+                'url': info['pipeline_url'],
+                'color': int(STATUS_COLORS.get(status, '#439fe0').lstrip('#'), 16),
+                'fields': [
+                    {'name': 'Branch', 'value': info['commit_ref'], 'inline': True},
+                    {'name': 'Commit', 'value': info['commit_short_sha'], 'inline': True},
+                    {'name': 'Author', 'value': info['commit_author'], 'inline': True},
+                    {'name': 'Message', 'value': self.commit_message_truncated, 'inline': False}
+                ]
+            }]
+        }
+
+    def _build_email_body(self):
+        """Build the plain-text email body."""
+        info = self.pipeline_info
+        return (
+            f"Pipeline {info['pipeline_status']} for project {info['project_name']}\n\n"
+            f"Branch: {info['commit_ref']}\n"
+            f"Commit: {info['commit_short_sha']}\n"
+            f"Author: {info['commit_author']}\n"
+            f"Message: {self.commit_message_truncated}\n"
+            f"Pipeline: {info['pipeline_url']}\n"
+        )
+
+    def send_slack_notification(self, webhook_url):
+        """Send notification to a Slack incoming webhook."""
+        try:
+            response = requests.post(webhook_url, json=self._build_slack_payload(), timeout=10)
+            if response.status_code == 200:
+                logger.info("✅ Slack notification sent")
+                return True
+            logger.error(f"❌ Slack notification failed: HTTP {response.status_code}")
+            return False
+        except requests.exceptions.RequestException as e:
+            logger.error(f"❌ Slack notification failed: {e}")
+            return False
+
+    def send_teams_notification(self, webhook_url):
+        """Send notification to a Microsoft Teams webhook."""
+        try:
+            response = requests.post(webhook_url, json=self._build_teams_payload(), timeout=10)
+            if response.status_code in (200, 202):
+                logger.info("✅ Teams notification sent")
+                return True
+            logger.error(f"❌ Teams notification failed: HTTP {response.status_code}")
+            return False
+        except requests.exceptions.RequestException as e:
+            logger.error(f"❌ Teams notification failed: {e}")
+            return False
+
+    def send_discord_notification(self, webhook_url):
+        """Send notification to a Discord webhook."""
+        try:
+            response = requests.post(webhook_url, json=self._build_discord_payload(), timeout=10)
+            if response.status_code in (200, 204):
+                logger.info("✅ Discord notification sent")
+                return True
+            logger.error(f"❌ Discord notification failed: HTTP {response.status_code}")
+            return False
+        except requests.exceptions.RequestException as e:
+            logger.error(f"❌ Discord notification failed: {e}")
+            return False
+
+    def send_email_notification(self, sender, recipients):
+        """Send notification email via Amazon SES."""
+        try:
+            ses_client = boto3.client('ses')
+            info = self.pipeline_info
+            ses_client.send_email(
+                Source=sender,
+                Destination={'ToAddresses': recipients},
+                Message={
+                    'Subject': {'Data': f"Pipeline {info['pipeline_status']}: {info['project_name']}"},
+                    'Body': {'Text': {'Data': self._build_email_body()}}
+                }
+            )
+            logger.info("✅ Email notification sent")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Email notification failed: {e}")
+            return False
+
+    def dispatch(self, channels):
+        """Send to all configured channels concurrently, bounded by
+        MAX_CONCURRENT_SENDS so a fan-out to many webhooks cannot open an
+        unbounded number of connections at once. A slow webhook host only
+        occupies its own worker, so it cannot starve the other channels."""
+        if len(channels) == 1:
+            name, func, call_args = channels[0]
+            return {name: func(*call_args)}
+
+        results = {}
+        workers = min(MAX_CONCURRENT_SENDS, len(channels))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(func, *call_args): name
+                for name, func, call_args in channels
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+
+    def save_notification_log(self, results):
+        """Save the notification log for CI-job debugging.
+
+        The log is machine-read (if at all), so serialize once to a compact
+        buffer and write it in a single syscall instead of pretty-printing
+        through json.dump's buffered writer.
+        """
+        try:
+            log_data = {
+                'pipeline_info': self.pipeline_info,
+                'results': results
+            }
+            if orjson is not None:
+                data = orjson.dumps(log_data, option=orjson.OPT_APPEND_NEWLINE)
+            else:
+                data = (json.dumps(log_data, default=str) + '\n').encode()
+            fd = os.open('notification_log.json', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            logger.info("📄 Notification log saved to: notification_log.json")
+        except Exception as e:
+            logger.error(f"❌ Failed to save notification log: {e}")
+
 
 def main():
     parser = argparse.ArgumentParser(description='Send Pipeline Notification')
     parser.add_argument('--pipeline-status', required=True, help='Pipeline status')
     parser.add_argument('--project-name', required=True, help='Project name')
     parser.add_argument('--pipeline-url', help='Pipeline URL')
-    
+    parser.add_argument('--slack-webhook', help='Slack incoming webhook URL')
+    parser.add_argument('--teams-webhook', help='Microsoft Teams webhook URL')
+    parser.add_argument('--discord-webhook', help='Discord webhook URL')
+    parser.add_argument('--email-sender', help='SES sender address')
+    parser.add_argument('--email-recipients', nargs='*', default=[],
+                        help='Email recipient addresses')
+    parser.add_argument('--no-log', action='store_true',
+                        help='Do not save the notification log')
+
     args = parser.parse_args()
-    
-    print(f"Sending notification for project: {args.project_name}")
-    print(f"Pipeline status: {args.pipeline_status}")
-    
-    if args.pipeline_url:
-        print(f"Pipeline URL: {args.pipeline_url}")
-    
-    # Mock notification
-    print("✅ Notification sent successfully")
-    
-    return 0
+
+    # Bail out before building the sender: constructing NotificationSender
+    # walks all the CI environment variables, which is wasted work when no
+    # channel is configured.
+    if not any([args.slack_webhook, args.teams_webhook, args.discord_webhook, args.email_sender]):
+        logger.warning("⚠️ No notification channels configured")
+        return 0
+
+    logger.info(f"📣 Sending notification for project: {args.project_name}")
+    logger.info(f"Pipeline status: {args.pipeline_status}")
+
+    sender = NotificationSender(args.pipeline_status, args.project_name, args.pipeline_url)
+
+    channels = []
+    if args.slack_webhook:
+        channels.append(('slack', sender.send_slack_notification, (args.slack_webhook,)))
+    if args.teams_webhook:
+        channels.append(('teams', sender.send_teams_notification, (args.teams_webhook,)))
+    if args.discord_webhook:
+        channels.append(('discord', sender.send_discord_notification, (args.discord_webhook,)))
+    if args.email_sender:
+        channels.append(('email', sender.send_email_notification,
+                         (args.email_sender, args.email_recipients)))
+
+    results = sender.dispatch(channels)
+
+    if not args.no_log:
+        sender.save_notification_log(results)
+
+    if all(results.values()):
+        logger.info("✅ All notifications sent successfully")
+        return 0
+
+    logger.error("❌ Some notifications failed")
+    return 1
+
 
 if __name__ == '__main__':
     sys.exit(main())
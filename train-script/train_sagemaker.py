@@ -0,0 +1,713 @@
+#!/usr/bin/env python3
+"""
+SageMaker Training Job Launcher
+Launches and monitors SageMaker training jobs (PyTorch or built-in XGBoost)
+from the GitLab CI/CD pipeline.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import types
+from datetime import datetime, timezone
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import WaiterError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token-bucket rate limiter for control-plane API calls.
+
+    Sleeping a few milliseconds up front is far cheaper than a
+    ThrottlingException retry storm, which multiplies effective API cost
+    under the default retry policy.
+    """
+
+    def __init__(self, rate_per_sec, burst):
+        self.rate = rate_per_sec
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            wait_time = max(0.0, (1 - self.tokens) / self.rate)
+            if wait_time:
+                time.sleep(wait_time)
+                self.tokens = 1.0
+                self.last_refill = time.monotonic()
+            self.tokens -= 1
+
+
+# CreateTrainingJob has a low documented TPS; pace submissions so parallel
+# sweeps do not trip 'Rate exceeded'.
+_CREATE_JOB_BUCKET = TokenBucket(rate_per_sec=1.0, burst=4)
+
+# Adaptive retry mode backs off client-side when AWS signals throttling;
+# a widened, keepalive connection pool lets parallel submissions reuse TLS
+# sessions instead of handshaking per call.
+_CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    max_pool_connections=50,
+    tcp_keepalive=True
+)
+
+# One shared Session so every client reuses the same resolved credentials
+# and endpoint data instead of re-reading them per client.
+_SESSION = boto3.session.Session()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_clients(region):
+    """Return the shared (sagemaker, s3) clients for a region.
+
+    Client construction costs hundreds of ms (endpoint discovery,
+    credential resolution, service model load); CI loops that build a
+    trainer per job should pay that once per region, not per instance.
+    boto3 clients are thread-safe for the operations used here.
+    """
+    return (
+        _SESSION.client('sagemaker', region_name=region, config=_CLIENT_CONFIG),
+        _SESSION.client('s3', region_name=region, config=_CLIENT_CONFIG)
+    )
+
+
+_TERMINAL_STATES = ('Completed', 'Failed', 'Stopped')
+
+# describe_training_job responses for terminal jobs are immutable, but
+# get_training_job_info, get_training_metrics, and save_training_metrics each
+# re-describe the same job. Cache only terminal responses so in-progress
+# statuses stay fresh.
+_describe_cache = {}
+
+
+def _describe_training_job_cached(client, job_name):
+    """Describe a training job, reusing the cached terminal-state response."""
+    cached = _describe_cache.get(job_name)
+    if cached is not None:
+        return cached
+    response = client.describe_training_job(TrainingJobName=job_name)
+    if response['TrainingJobStatus'] in _TERMINAL_STATES:
+        _describe_cache[job_name] = response
+    return response
+
+
+def _write_metrics_file(job_info, output_file, fmt='json'):
+    """Write a metrics artifact atomically.
+
+    orjson serializes several times faster than stdlib json, and the
+    write-to-temp + os.replace keeps CI from ever seeing a partial file.
+    The msgpack format skips JSON's whitespace and text encoding entirely
+    for pipelines where only machines read the artifact.
+    """
+    if fmt == 'msgpack':
+        # Only needed for the opt-in binary format.
+        import msgpack
+        data = msgpack.packb(job_info, default=str, use_bin_type=True)
+    elif orjson is not None:
+        data = orjson.dumps(job_info, option=orjson.OPT_INDENT_2, default=str)
+    else:
+        data = json.dumps(job_info, indent=2, default=str).encode()
+    tmp = output_file + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, output_file)
+
+
+class BaseTrainer:
+    """Shared launch/wait/report plumbing for SageMaker training jobs.
+
+    Subclasses supply the container image plus the class-level channel,
+    hyperparameter, and tag defaults; everything else is common.
+    """
+
+    # (channel name, bucket prefix) pairs for InputDataConfig.
+    channels = (('training', 'training-data/'),)
+    default_hyperparameters = {}
+    extra_tags = ()
+    collect_instance_metrics = False
+
+    def __init__(self, region='us-east-1', role_arn=None, bucket=None):
+        self.region = region
+        self.role_arn = role_arn
+        self.bucket = bucket
+        self.sagemaker_client, self.s3_client = _get_clients(region)
+        # Static pieces of the job config, built once instead of being
+        # re-f-string'd and re-allocated on every create_training_job call.
+        # boto3 does not mutate request inputs, so sharing them is safe.
+        self.output_uri = f's3://{self.bucket}/training-output/'
+        self.channel_uris = {
+            channel_name: f's3://{self.bucket}/{prefix}'
+            for channel_name, prefix in self.channels
+        }
+        self._input_data_config = [
+            {
+                'ChannelName': channel_name,
+                'DataSource': {
+                    'S3DataSource': {
+                        'S3DataType': 'S3Prefix',
+                        'S3Uri': uri,
+                        'S3DataDistributionType': 'FullyReplicated'
+                    }
+                },
+                'ContentType': 'text/csv'
+            }
+            for channel_name, uri in self.channel_uris.items()
+        ]
+        self._tags = [
+            {'Key': 'Project', 'Value': 'gitlab-sagemaker-cicd'},
+            *self.extra_tags,
+            {'Key': 'LaunchedBy', 'Value': 'gitlab-ci'}
+        ]
+        # Frozen skeleton of the create_training_job request. Per-call
+        # construction only shallow-copies this and fills the None slots;
+        # the static subtrees are shared, and the per-call slots always get
+        # fresh objects so the shared copy is never mutated.
+        self._config_template = {
+            'TrainingJobName': None,
+            'RoleArn': self.role_arn,
+            'AlgorithmSpecification': {
+                'TrainingImage': self.get_container_uri(),
+                'TrainingInputMode': 'File'
+            },
+            'InputDataConfig': self._input_data_config,
+            'OutputDataConfig': {
+                'S3OutputPath': self.output_uri
+            },
+            'ResourceConfig': None,
+            'StoppingCondition': None,
+            'HyperParameters': None,
+            'Tags': self._tags
+        }
+
+    def get_container_uri(self):
+        """Return the training container URI for this region."""
+        raise NotImplementedError
+
+    def build_training_job_config(self, job_name, instance_type='ml.m5.large',
+                                  hyperparameters=None, max_runtime=3600):
+        """Build the create_training_job request for this job."""
+        config = self._config_template.copy()
+        config['TrainingJobName'] = job_name
+        config['ResourceConfig'] = {
+            'InstanceType': instance_type,
+            'InstanceCount': 1,
+            'VolumeSizeInGB': 30
+        }
+        config['StoppingCondition'] = {'MaxRuntimeInSeconds': max_runtime}
+        config['HyperParameters'] = {
+            **self.default_hyperparameters,
+            **{k: str(v) for k, v in (hyperparameters or {}).items()}
+        }
+        return config
+
+    def _assert_prefix_nonempty(self, prefix):
+        """Fail fast if an input prefix has no objects.
+
+        A single MaxKeys=1 listing costs ~50ms; submitting the job anyway
+        costs minutes of instance startup before SageMaker reports the
+        missing data.
+        """
+        response = self.s3_client.list_objects_v2(
+            Bucket=self.bucket, Prefix=prefix, MaxKeys=1
+        )
+        if response.get('KeyCount', 0) == 0:
+            raise ValueError(
+                f"No training data found at s3://{self.bucket}/{prefix}"
+            )
+
+    def create_training_job(self, job_name, instance_type='ml.m5.large',
+                            hyperparameters=None, max_runtime=3600):
+        """Create a SageMaker training job."""
+        for _, prefix in self.channels:
+            self._assert_prefix_nonempty(prefix)
+
+        training_job_config = self.build_training_job_config(
+            job_name, instance_type=instance_type,
+            hyperparameters=hyperparameters, max_runtime=max_runtime
+        )
+        _CREATE_JOB_BUCKET.acquire()
+        logger.info(f"🚀 Creating training job: {job_name}")
+        response = self.sagemaker_client.create_training_job(**training_job_config)
+        logger.info(f"✅ Training job created: {response['TrainingJobArn']}")
+        return response
+
+    def _stream_new_logs(self, logs_client, job_name, last_ts):
+        """Relay new training-log events to the logger.
+
+        Returns the next startTime cursor so each call only fetches events
+        that arrived since the previous one.
+        """
+        try:
+            events = logs_client.filter_log_events(
+                logGroupName='/aws/sagemaker/TrainingJobs',
+                logStreamNamePrefix=job_name,
+                startTime=last_ts
+            ).get('events', [])
+        except logs_client.exceptions.ResourceNotFoundException:
+            # Log group/stream appears only once the instance boots.
+            return last_ts
+        for event in events:
+            logger.info(f"📋 {event['message'].rstrip()}")
+        if events:
+            return max(e['timestamp'] for e in events) + 1
+        return last_ts
+
+    def wait_for_training_job(self, job_name, timeout=7200, event_driven=False,
+                              stream_logs=False):
+        """Wait for a training job to reach a terminal state.
+
+        With event_driven=True the wait blocks on push-delivered EventBridge
+        state-change events via an SQS long poll instead of re-describing the
+        job, which avoids burning Describe API calls (and
+        ThrottlingExceptions) when many jobs run in parallel.
+
+        With stream_logs=True the wait relays CloudWatch training logs as
+        they arrive, so in-progress loss metrics show up in the CI job
+        output instead of requiring a separate console session.
+        """
+        if event_driven:
+            return self._wait_via_eventbridge(job_name, timeout, stream_logs=stream_logs)
+
+        if stream_logs:
+            return self._wait_streaming_logs(job_name, timeout)
+
+        logger.info(f"⏳ Waiting for training job: {job_name}")
+        # The built-in waiter handles throttling and transient network errors
+        # consistently; a 60s delay halves Describe calls over a typical job
+        # compared to a hand-rolled 30s sleep loop.
+        waiter = self.sagemaker_client.get_waiter('training_job_completed_or_stopped')
+        try:
+            waiter.wait(
+                TrainingJobName=job_name,
+                WaiterConfig={'Delay': 60, 'MaxAttempts': max(1, timeout // 60)}
+            )
+        except WaiterError as e:
+            # The waiter raises when the job lands in Failed; the job is
+            # still terminal, so fall through to the describe below so
+            # callers can log FailureReason and save the metrics artifact.
+            logger.warning(f"⚠️ Waiter finished with error state: {e}")
+        return _describe_training_job_cached(self.sagemaker_client, job_name)
+
+    def _wait_streaming_logs(self, job_name, timeout=7200, poll_interval=30):
+        """Poll for completion while relaying training logs.
+
+        The describe cadence stays at poll_interval; the richer data comes
+        from the log stream, not from describing more often.
+        """
+        logs_client = _SESSION.client('logs', region_name=self.region,
+                                      config=_CLIENT_CONFIG)
+        logger.info(f"⏳ Waiting for training job (streaming logs): {job_name}")
+        start_time = time.monotonic()
+        last_ts = 0
+
+        while True:
+            if time.monotonic() - start_time > timeout:
+                raise TimeoutError(f"Training job {job_name} did not finish within {timeout}s")
+
+            last_ts = self._stream_new_logs(logs_client, job_name, last_ts)
+            response = _describe_training_job_cached(self.sagemaker_client, job_name)
+            if response['TrainingJobStatus'] in _TERMINAL_STATES:
+                self._stream_new_logs(logs_client, job_name, last_ts)
+                return response
+
+            time.sleep(poll_interval)
+
+    def _wait_via_eventbridge(self, job_name, timeout=7200, stream_logs=False):
+        """Block on SageMaker Training Job State Change events via SQS.
+
+        Creates a temporary SQS queue subscribed to an EventBridge rule
+        scoped to this job, long-polls for state transitions, and tears the
+        plumbing down afterwards. One final describe_training_job fetches
+        ModelArtifacts/FailureReason, which the event detail omits.
+        """
+        sqs_client = _SESSION.client('sqs', region_name=self.region, config=_CLIENT_CONFIG)
+        events_client = _SESSION.client('events', region_name=self.region,
+                                        config=_CLIENT_CONFIG)
+        rule_name = f'sagemaker-state-{job_name}'[:64]
+        queue_name = f'sagemaker-wait-{job_name}'[:80]
+
+        queue_url = sqs_client.create_queue(QueueName=queue_name)['QueueUrl']
+        queue_arn = sqs_client.get_queue_attributes(
+            QueueUrl=queue_url, AttributeNames=['QueueArn']
+        )['Attributes']['QueueArn']
+
+        rule_arn = events_client.put_rule(
+            Name=rule_name,
+            EventPattern=json.dumps({
+                'source': ['aws.sagemaker'],
+                'detail-type': ['SageMaker Training Job State Change'],
+                'detail': {'TrainingJobName': [job_name]}
+            }),
+            State='ENABLED'
+        )['RuleArn']
+
+        sqs_client.set_queue_attributes(
+            QueueUrl=queue_url,
+            Attributes={
+                'Policy': json.dumps({
+                    'Version': '2012-10-17',
+                    'Statement': [{
+                        'Effect': 'Allow',
+                        'Principal': {'Service': 'events.amazonaws.com'},
+                        'Action': 'sqs:SendMessage',
+                        'Resource': queue_arn,
+                        'Condition': {'ArnEquals': {'aws:SourceArn': rule_arn}}
+                    }]
+                })
+            }
+        )
+        events_client.put_targets(
+            Rule=rule_name,
+            Targets=[{'Id': 'wait-queue', 'Arn': queue_arn}]
+        )
+
+        logger.info(f"⏳ Waiting for training job via EventBridge: {job_name}")
+        logs_client = _SESSION.client('logs', region_name=self.region,
+                                      config=_CLIENT_CONFIG) if stream_logs else None
+        last_ts = 0
+        start_time = time.monotonic()
+
+        try:
+            while True:
+                if time.monotonic() - start_time > timeout:
+                    raise TimeoutError(f"Training job {job_name} did not finish within {timeout}s")
+
+                if stream_logs:
+                    last_ts = self._stream_new_logs(logs_client, job_name, last_ts)
+
+                messages = sqs_client.receive_message(
+                    QueueUrl=queue_url,
+                    WaitTimeSeconds=20,
+                    MaxNumberOfMessages=10
+                ).get('Messages', [])
+
+                for message in messages:
+                    detail = json.loads(message['Body']).get('detail', {})
+                    status = detail.get('TrainingJobStatus')
+                    logger.info(f"🔄 Training job status: {status}")
+                    sqs_client.delete_message(
+                        QueueUrl=queue_url, ReceiptHandle=message['ReceiptHandle']
+                    )
+                    if status in _TERMINAL_STATES:
+                        return _describe_training_job_cached(
+                            self.sagemaker_client, job_name
+                        )
+        finally:
+            events_client.remove_targets(Rule=rule_name, Ids=['wait-queue'])
+            events_client.delete_rule(Name=rule_name)
+            sqs_client.delete_queue(QueueUrl=queue_url)
+
+    def get_training_job_info(self, job_name):
+        """Fetch a summary of the training job."""
+        response = _describe_training_job_cached(self.sagemaker_client, job_name)
+        return {
+            'job_name': response['TrainingJobName'],
+            'status': response['TrainingJobStatus'],
+            'creation_time': response['CreationTime'],
+            'training_start_time': response.get('TrainingStartTime'),
+            'training_end_time': response.get('TrainingEndTime'),
+            'instance_type': response['ResourceConfig']['InstanceType'],
+            'model_artifacts': response.get('ModelArtifacts', {}).get('S3ModelArtifacts'),
+            'failure_reason': response.get('FailureReason')
+        }
+
+    def get_training_metrics(self, job_name):
+        """Fetch the final metrics reported by the training job."""
+        response = _describe_training_job_cached(self.sagemaker_client, job_name)
+        return {
+            m['MetricName']: m['Value']
+            for m in response.get('FinalMetricDataList', [])
+        }
+
+    def _fetch_instance_metrics(self, job_name, job_info):
+        """Fetch average instance utilization over the job's lifetime."""
+        cloudwatch = _SESSION.client('cloudwatch', region_name=self.region,
+                                     config=_CLIENT_CONFIG)
+        metrics_to_fetch = ['CPUUtilization', 'MemoryUtilization',
+                            'DiskUtilization', 'GPUUtilization']
+        instance_metrics = {}
+        # Query only the job's lifetime: a day-start window returned up to
+        # 288 mostly-empty datapoints per metric at Period=300.
+        start_time = job_info['creation_time']
+        end_time = job_info.get('training_end_time') or datetime.now(timezone.utc)
+        try:
+            # One GetMetricData request fetches all four metrics instead of
+            # four serialized GetMetricStatistics round-trips.
+            response = cloudwatch.get_metric_data(
+                MetricDataQueries=[
+                    {
+                        'Id': f'm{i}',
+                        'MetricStat': {
+                            'Metric': {
+                                'Namespace': '/aws/sagemaker/TrainingJobs',
+                                'MetricName': metric_name,
+                                'Dimensions': [{'Name': 'Host', 'Value': f'{job_name}/algo-1'}]
+                            },
+                            'Period': 60,
+                            'Stat': 'Average'
+                        }
+                    }
+                    for i, metric_name in enumerate(metrics_to_fetch)
+                ],
+                StartTime=start_time,
+                EndTime=end_time
+            )
+            for result in response.get('MetricDataResults', []):
+                metric_name = metrics_to_fetch[int(result['Id'][1:])]
+                values = result.get('Values', [])
+                if values:
+                    instance_metrics[metric_name] = sum(values) / len(values)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not fetch instance metrics: {e}")
+        return instance_metrics
+
+    def save_training_metrics(self, job_name, output_file=None, fmt='json'):
+        """Save job info and metrics to an artifact file for CI.
+
+        fmt='msgpack' emits a smaller, faster-to-parse binary artifact for
+        machine-only consumers; JSON stays the default for back-compat.
+        """
+        if output_file is None:
+            output_file = ('training_metrics.msgpack' if fmt == 'msgpack'
+                           else 'training_metrics.json')
+        job_info = self.get_training_job_info(job_name)
+        job_info['metrics'] = self.get_training_metrics(job_name)
+        job_info['saved_at'] = datetime.now(timezone.utc).isoformat()
+
+        if self.collect_instance_metrics:
+            job_info['instance_metrics'] = self._fetch_instance_metrics(job_name, job_info)
+
+        _write_metrics_file(job_info, output_file, fmt=fmt)
+        logger.info(f"📄 Training metrics saved to: {output_file}")
+        return job_info
+
+
+class SageMakerTrainer(BaseTrainer):
+    """Launches PyTorch framework training jobs."""
+
+    def get_container_uri(self):
+        """Return the PyTorch training container URI for this region."""
+        return f"763104351884.dkr.ecr.{self.region}.amazonaws.com/pytorch-training:2.0.1-cpu-py310"
+
+
+# Fallback image table for runners without the sagemaker SDK installed.
+# Built once at import and wrapped read-only so no instance ever pays for
+# (or mutates) a private copy.
+_XGBOOST_CONTAINERS = types.MappingProxyType({
+    'us-east-1': '683313688378.dkr.ecr.us-east-1.amazonaws.com/sagemaker-xgboost:1.7-1',
+    'us-east-2': '257758044811.dkr.ecr.us-east-2.amazonaws.com/sagemaker-xgboost:1.7-1',
+    'us-west-1': '746614075791.dkr.ecr.us-west-1.amazonaws.com/sagemaker-xgboost:1.7-1',
+    'us-west-2': '246618743249.dkr.ecr.us-west-2.amazonaws.com/sagemaker-xgboost:1.7-1',
+    'eu-west-1': '141502667606.dkr.ecr.eu-west-1.amazonaws.com/sagemaker-xgboost:1.7-1',
+    'eu-central-1': '492215442770.dkr.ecr.eu-central-1.amazonaws.com/sagemaker-xgboost:1.7-1',
+    'ap-southeast-1': '121021644041.dkr.ecr.ap-southeast-1.amazonaws.com/sagemaker-xgboost:1.7-1',
+    'ap-southeast-2': '783357654285.dkr.ecr.ap-southeast-2.amazonaws.com/sagemaker-xgboost:1.7-1',
+    'ap-northeast-1': '354813040037.dkr.ecr.ap-northeast-1.amazonaws.com/sagemaker-xgboost:1.7-1',
+    'ca-central-1': '341280168497.dkr.ecr.ca-central-1.amazonaws.com/sagemaker-xgboost:1.7-1'
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_xgboost_image(region, version='1.7-1'):
+    """Resolve the built-in XGBoost image for a region via the SageMaker SDK.
+
+    The SDK's registry covers every region and picks up new image releases,
+    unlike a hardcoded ECR table. Memoized because retrieval walks the SDK's
+    JSON registry on every call. Falls back to the static table when the SDK
+    is not installed.
+    """
+    try:
+        from sagemaker import image_uris
+    except ImportError:
+        try:
+            return _XGBOOST_CONTAINERS[region]
+        except KeyError:
+            raise ValueError(f"No XGBoost container registered for region: {region}")
+    return image_uris.retrieve(framework='xgboost', region=region, version=version)
+
+
+class XGBoostTrainer(BaseTrainer):
+    """Launches built-in algorithm XGBoost training jobs."""
+
+    channels = (('train', 'training-data/'), ('validation', 'validation-data/'))
+    default_hyperparameters = {
+        'num_round': '100',
+        'max_depth': '6',
+        'eta': '0.3',
+        'objective': 'reg:squarederror',
+        'subsample': '0.8',
+        'colsample_bytree': '0.8',
+        'min_child_weight': '1',
+        'verbosity': '1'
+    }
+    extra_tags = ({'Key': 'Algorithm', 'Value': 'xgboost'},)
+    collect_instance_metrics = True
+
+    def get_container_uri(self):
+        return self.get_xgboost_container_uri()
+
+    def get_xgboost_container_uri(self):
+        """Return the XGBoost container URI for this region."""
+        return _resolve_xgboost_image(self.region)
+
+
+async def _run_one(client, trainer, job, semaphore, poll_interval=30, timeout=7200):
+    """Create one training job and await its terminal state cooperatively."""
+    async with semaphore:
+        config = trainer.build_training_job_config(
+            job['job_name'],
+            instance_type=job.get('instance_type', 'ml.m5.large'),
+            hyperparameters=job.get('hyperparameters'),
+            max_runtime=job.get('max_runtime', 3600)
+        )
+        logger.info(f"🚀 Creating training job: {job['job_name']}")
+        await client.create_training_job(**config)
+
+        start_time = time.monotonic()
+        while True:
+            if time.monotonic() - start_time > timeout:
+                raise TimeoutError(
+                    f"Training job {job['job_name']} did not finish within {timeout}s"
+                )
+            response = await client.describe_training_job(TrainingJobName=job['job_name'])
+            status = response['TrainingJobStatus']
+            if status in ('Completed', 'Failed', 'Stopped'):
+                logger.info(f"🏁 {job['job_name']}: {status}")
+                return response
+            await asyncio.sleep(poll_interval)
+
+
+async def run_many(jobs, region='us-east-1', role_arn=None, bucket=None,
+                   framework='xgboost', max_concurrency=5, timeout=7200):
+    """Drive many training jobs concurrently on one event loop.
+
+    Each in-flight job costs a coroutine frame instead of a blocked OS
+    thread, so a single process can orchestrate a full sweep. The semaphore
+    bounds concurrent create/describe calls to stay under the SageMaker
+    control-plane rate limit.
+    """
+    # aioboto3 is only needed for the multi-job path; keep the single-job
+    # CLI usable without it.
+    import aioboto3
+
+    trainer_cls = XGBoostTrainer if framework == 'xgboost' else SageMakerTrainer
+    trainer = trainer_cls(region=region, role_arn=role_arn, bucket=bucket)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    session = aioboto3.Session()
+    async with session.client('sagemaker', region_name=region) as client:
+        return await asyncio.gather(
+            *(_run_one(client, trainer, job, semaphore, timeout=timeout) for job in jobs)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Launch SageMaker Training Job')
+    parser.add_argument('--framework', choices=['pytorch', 'xgboost'], default='xgboost',
+                        help='Training framework')
+    parser.add_argument('--job-name', help='Training job name')
+    parser.add_argument('--jobs-file',
+                        help='JSON file with a list of job specs to run concurrently')
+    parser.add_argument('--max-concurrency', type=int, default=5,
+                        help='Concurrent jobs when using --jobs-file')
+    parser.add_argument('--role-arn', required=True, help='SageMaker execution role ARN')
+    parser.add_argument('--s3-bucket', required=True, help='S3 bucket for data and output')
+    parser.add_argument('--region', default='us-east-1', help='AWS region')
+    parser.add_argument('--instance-type', default='ml.m5.large', help='Instance type')
+    parser.add_argument('--max-runtime', type=int, default=3600, help='Max runtime in seconds')
+    parser.add_argument('--wait', action='store_true', help='Wait for job completion')
+    parser.add_argument('--event-driven', action='store_true',
+                        help='Wait on EventBridge state-change events instead of polling')
+    parser.add_argument('--stream-logs', action='store_true',
+                        help='Relay CloudWatch training logs while waiting')
+    parser.add_argument('--timeout', type=int, default=7200, help='Wait timeout in seconds')
+    parser.add_argument('--hyperparameters', help='Hyperparameters as JSON string')
+    parser.add_argument('--format', choices=['json', 'msgpack'], default='json',
+                        help='Metrics artifact format')
+
+    args = parser.parse_args()
+
+    if not args.job_name and not args.jobs_file:
+        parser.error('one of --job-name or --jobs-file is required')
+
+    if args.jobs_file:
+        with open(args.jobs_file) as f:
+            jobs = json.load(f)
+        try:
+            responses = asyncio.run(run_many(
+                jobs, region=args.region, role_arn=args.role_arn,
+                bucket=args.s3_bucket, framework=args.framework,
+                max_concurrency=args.max_concurrency, timeout=args.timeout
+            ))
+        except Exception as e:
+            logger.error(f"❌ Concurrent training run failed: {e}")
+            return 1
+        failed = [r['TrainingJobName'] for r in responses
+                  if r['TrainingJobStatus'] != 'Completed']
+        if failed:
+            logger.error(f"❌ Jobs did not complete: {failed}")
+            return 1
+        logger.info(f"✅ All {len(responses)} training jobs completed")
+        return 0
+
+    hyperparameters = json.loads(args.hyperparameters) if args.hyperparameters else None
+
+    trainer_cls = XGBoostTrainer if args.framework == 'xgboost' else SageMakerTrainer
+    trainer = trainer_cls(region=args.region, role_arn=args.role_arn, bucket=args.s3_bucket)
+
+    try:
+        trainer.create_training_job(
+            args.job_name,
+            instance_type=args.instance_type,
+            hyperparameters=hyperparameters,
+            max_runtime=args.max_runtime
+        )
+
+        if args.wait:
+            response = trainer.wait_for_training_job(
+                args.job_name, timeout=args.timeout,
+                event_driven=args.event_driven, stream_logs=args.stream_logs
+            )
+            status = response['TrainingJobStatus']
+            trainer.save_training_metrics(args.job_name, fmt=args.format)
+
+            if status != 'Completed':
+                logger.error(f"❌ Training job finished with status: {status}")
+                if response.get('FailureReason'):
+                    logger.error(f"❌ Failure reason: {response['FailureReason']}")
+                return 1
+            logger.info("✅ Training job completed successfully")
+
+        return 0
+    except Exception as e:
+        logger.error(f"❌ Training job failed: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
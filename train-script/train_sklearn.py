@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Scikit-learn training entry point for SageMaker training jobs."""
+
+import argparse
+import json
+import logging
+import os
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import lz4  # noqa: F401 — probe only; joblib uses it internally
+    _JOBLIB_COMPRESS = ('lz4', 3)
+except ImportError:
+    _JOBLIB_COMPRESS = ('zlib', 3)
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _read_table(data_dir, stem):
+    """Read one data table, preferring a Parquet copy over the CSV.
+
+    Parquet is columnar, typed and zstd-compressed, so repeat jobs on the
+    same channel skip CSV tokenization and move far fewer bytes. The first
+    run warms the cache by writing the Parquet next to the CSV.
+    """
+    parquet_path = os.path.join(data_dir, f'{stem}.parquet')
+    csv_path = os.path.join(data_dir, f'{stem}.csv')
+    if os.path.exists(parquet_path):
+        logger.info(f"📥 Loading {parquet_path}")
+        return pd.read_parquet(parquet_path, engine='pyarrow')
+    logger.info(f"📥 Loading {csv_path}")
+    df = pd.read_csv(csv_path, engine='pyarrow', dtype_backend='pyarrow')
+    try:
+        df.to_parquet(parquet_path, engine='pyarrow', compression='zstd')
+        logger.info(f"💾 Cached Parquet copy at {parquet_path}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not write Parquet cache: {e}")
+    return df
+
+
+def load_data(train_dir, validation_dir, target_column='target'):
+    """Load training and validation data into feature/target arrays.
+
+    Parses with pandas' PyArrow engine, which reads row chunks across
+    cores and hands columns over zero-copy, instead of the default
+    single-threaded C reader re-inferring every dtype.
+    """
+    # The two reads are independent and release the GIL while parsing, so
+    # load them in parallel: wall time is the slower of the two instead of
+    # their sum.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        train_future = executor.submit(_read_table, train_dir, 'train')
+        validation_future = executor.submit(_read_table, validation_dir, 'validation')
+        train_df = train_future.result()
+        validation_df = validation_future.result()
+
+    train_df = _downcast(train_df)
+    validation_df = _downcast(validation_df)
+
+    X_train, y_train = _split_features(train_df, target_column)
+    X_val, y_val = _split_features(validation_df, target_column)
+
+    logger.info(f"📊 Training samples: {len(y_train)}, validation samples: {len(y_val)}")
+    return X_train, y_train, X_val, y_val
+
+
+def _split_features(df, target_column):
+    """Split a frame into feature matrix and target vector.
+
+    With the target ordered last, one float32 to_numpy conversion yields
+    both: X is a slice view of that array and y a small integer cast.
+    The previous .drop() materialized a second full-width DataFrame that
+    sklearn would have copied again at fit time.
+    """
+    cols = [c for c in df.columns if c != target_column] + [target_column]
+    arr = df[cols].to_numpy(dtype=np.float32)
+    X = arr[:, :-1]
+    y = arr[:, -1].astype(np.int32)
+    return X, y
+
+
+def _downcast(df):
+    """Shrink column dtypes before fit.
+
+    Tree building is memory-bound on the feature matrix, and float32 is
+    plenty of precision for split thresholds — halving the dtype width
+    roughly halves the memory traffic.
+    """
+    for c in df.select_dtypes('float').columns:
+        df[c] = df[c].astype('float32')
+    for c in df.select_dtypes('int').columns:
+        df[c] = pd.to_numeric(df[c], downcast='integer')
+    return df
+
+
+def train_model(X_train, y_train, hyperparameters, model_type='random_forest'):
+    """Train a classifier of the requested type with the given hyperparameters."""
+    logger.info(f"🚀 Training {model_type} model with: {hyperparameters}")
+    if model_type == 'hist_gradient_boosting':
+        # Histogram gradient boosting bins features to uint8 internally and
+        # parallelizes splits with OpenMP — typically several times faster
+        # than a random forest on tabular data at similar accuracy.
+        model = HistGradientBoostingClassifier(
+            max_iter=hyperparameters['n_estimators'],
+            max_depth=hyperparameters['max_depth'],
+            random_state=42
+        )
+    else:
+        # Trees are independent, so let sklearn build (and later predict
+        # with) them across all cores instead of serially on one.
+        model = RandomForestClassifier(
+            n_estimators=hyperparameters['n_estimators'],
+            max_depth=hyperparameters['max_depth'],
+            random_state=42,
+            n_jobs=-1
+        )
+    model.fit(X_train, y_train)
+    logger.info("✅ Model training completed")
+    return model
+
+
+def evaluate_model(model, X_val, y_val):
+    """Evaluate the model on the validation set.
+
+    precision_recall_fscore_support computes the weighted scores in one
+    pass over the predictions, instead of classification_report building
+    a per-class dict and accuracy_score re-scanning separately.
+    """
+    logger.info("📈 Evaluating model on validation data")
+    predictions = model.predict(X_val)
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        y_val, predictions, average='weighted', zero_division=0)
+    accuracy = accuracy_score(y_val, predictions)
+    logger.info(f"📊 Validation accuracy: {accuracy:.4f}")
+    return {
+        'accuracy': accuracy,
+        'precision': precision,
+        'recall': recall,
+        'f1_score': f1
+    }
+
+
+def _dump_json(obj, path):
+    """Write obj as compact JSON, machine-consumed downstream.
+
+    orjson serializes in C (and handles numpy scalars natively) several
+    times faster than stdlib json; fall back to stdlib when it is not in
+    the container.
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, default=float)
+
+
+def save_model(model, model_dir):
+    """Persist the trained model for the serving container.
+
+    LZ4 compression shrinks the per-tree numpy arrays several-fold, so
+    both the S3 upload here and the load on the inference side move far
+    fewer bytes — LZ4 decompression is faster than the disk read it
+    replaces. Containers without the lz4 package fall back to zlib,
+    which joblib always supports.
+    """
+    model_path = os.path.join(model_dir, 'model.joblib')
+    joblib.dump(model, model_path, compress=_JOBLIB_COMPRESS,
+                protocol=pickle.HIGHEST_PROTOCOL)
+    logger.info(f"💾 Model saved to: {model_path}")
+
+
+def save_metrics(metrics, output_dir):
+    """Save evaluation metrics alongside the training output."""
+    os.makedirs(output_dir, exist_ok=True)
+    metrics_path = os.path.join(output_dir, 'metrics.json')
+    _dump_json(metrics, metrics_path)
+    logger.info(f"📄 Metrics saved to: {metrics_path}")
+
+
+def save_hyperparameters(hyperparameters, output_dir):
+    """Record the hyperparameters used for this run."""
+    os.makedirs(output_dir, exist_ok=True)
+    hp_path = os.path.join(output_dir, 'hyperparameters.json')
+    _dump_json(hyperparameters, hp_path)
+    logger.info(f"📄 Hyperparameters saved to: {hp_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scikit-learn SageMaker Training')
+    parser.add_argument('--model-dir', default=os.environ.get('SM_MODEL_DIR', '/opt/ml/model'),
+                        help='Directory to save the trained model')
+    parser.add_argument('--train', default=os.environ.get('SM_CHANNEL_TRAIN', '/opt/ml/input/data/train'),
+                        help='Directory containing the training data')
+    parser.add_argument('--validation', default=os.environ.get('SM_CHANNEL_VALIDATION', '/opt/ml/input/data/validation'),
+                        help='Directory containing the validation data')
+    parser.add_argument('--output-data-dir', default=os.environ.get('SM_OUTPUT_DATA_DIR', '/opt/ml/output/data'),
+                        help='Directory for metrics and other training output')
+    parser.add_argument('--target-column', default='target', help='Name of the target column')
+    parser.add_argument('--model-type', default='random_forest',
+                        choices=['random_forest', 'hist_gradient_boosting'],
+                        help='Classifier to train')
+    parser.add_argument('--n-estimators', type=int, default=100,
+                        help='Number of trees (boosting iterations for hist_gradient_boosting)')
+    parser.add_argument('--max-depth', type=int, default=10, help='Maximum tree depth')
+
+    args = parser.parse_args()
+
+    hyperparameters = {
+        'n_estimators': args.n_estimators,
+        'max_depth': args.max_depth
+    }
+
+    X_train, y_train, X_val, y_val = load_data(args.train, args.validation, args.target_column)
+
+    model = train_model(X_train, y_train, hyperparameters, args.model_type)
+    metrics = evaluate_model(model, X_val, y_val)
+
+    save_model(model, args.model_dir)
+    save_metrics(metrics, args.output_data_dir)
+    save_hyperparameters(hyperparameters, args.output_data_dir)
+
+    logger.info("🎉 Training run completed successfully")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())